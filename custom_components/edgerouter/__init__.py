@@ -23,13 +23,66 @@ from .const import (
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
 )
-from .edgerouter_api import EdgeRouterAPI, EdgeRouterConnectionError
+from .edgerouter_api import ClientInfo, EdgeRouterAPI, EdgeRouterConnectionError
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.DEVICE_TRACKER, Platform.SENSOR]
 
 
+class EdgeRouterCoordinator(DataUpdateCoordinator[dict[str, ClientInfo]]):
+    """Coordinator that polls the EdgeRouter and precomputes aggregates.
+
+    The connected/DHCP lists and counts are derived in a single pass over
+    the client dict here, so the entities can read them directly instead
+    of each rescanning the full dict on every state read.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: EdgeRouterAPI,
+        host: str,
+        scan_interval: int,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"EdgeRouter {host}",
+            update_interval=timedelta(seconds=scan_interval),
+        )
+        self.api = api
+        self.connected_count = 0
+        self.arp_count = 0
+        self.dhcp_count = 0
+        self.connected_list: tuple[ClientInfo, ...] = ()
+        self.dhcp_list: tuple[ClientInfo, ...] = ()
+
+    async def _async_update_data(self) -> dict[str, ClientInfo]:
+        """Fetch data from EdgeRouter and update the aggregates."""
+        try:
+            clients = await self.api.async_get_all_clients(self.hass.loop)
+        except EdgeRouterConnectionError as err:
+            raise UpdateFailed(f"Error communicating with EdgeRouter: {err}") from err
+
+        connected: list[ClientInfo] = []
+        dhcp: list[ClientInfo] = []
+        for client in clients.values():
+            if client.in_arp:
+                connected.append(client)
+            if client.has_dhcp_lease:
+                dhcp.append(client)
+
+        # Freeze the per-poll snapshots; consumers only ever iterate them
+        self.connected_list = tuple(connected)
+        self.dhcp_list = tuple(dhcp)
+        # Connected means present in the ARP table, so both counts agree
+        self.connected_count = self.arp_count = len(connected)
+        self.dhcp_count = len(dhcp)
+        return clients
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up EdgeRouter from a config entry."""
     host = entry.data[CONF_HOST]
@@ -39,25 +92,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     consider_home = entry.options.get(CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME)
 
-    api = EdgeRouterAPI(host, username, password, port)
+    api = EdgeRouterAPI(host, username, password, port, stale_after=consider_home)
 
-    async def async_update_data():
-        """Fetch data from EdgeRouter."""
-        try:
-            return await hass.async_add_executor_job(api.get_all_clients)
-        except EdgeRouterConnectionError as err:
-            raise UpdateFailed(f"Error communicating with EdgeRouter: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"EdgeRouter {host}",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=scan_interval),
-    )
+    coordinator = EdgeRouterCoordinator(hass, api, host, scan_interval)
 
     # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Setup is retried with a fresh API instance, so close this one
+        # rather than leaking its cached SSH connection on every attempt
+        await hass.async_add_executor_job(api.close)
+        raise
 
     # Get system info for device registry
     try:
@@ -98,6 +144,7 @@ async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await hass.async_add_executor_job(data["api"].close)
 
     return unload_ok
@@ -96,6 +96,10 @@ class EdgeRouterConfigFlow(ConfigFlow, domain=DOMAIN):
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
+            finally:
+                # The API caches a live SSH connection; setup creates its
+                # own instance, so drop this one whatever the outcome
+                await self.hass.async_add_executor_job(api.close)
 
         return self.async_show_form(
             step_id="user",
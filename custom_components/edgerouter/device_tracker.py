@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Any
 
 from homeassistant.components.device_tracker import SourceType
@@ -47,27 +48,31 @@ async def async_setup_entry(
 
     @callback
     def async_add_new_entities() -> None:
-        """Add new device tracker entities."""
-        new_entities = []
+        """Add device tracker entities for newly seen clients."""
         clients: dict[str, ClientInfo] = coordinator.data or {}
 
-        for mac, client in clients.items():
-            if mac not in tracked_macs:
-                tracked_macs.add(mac)
-                new_entities.append(
-                    EdgeRouterDeviceTracker(
-                        coordinator,
-                        config_entry.entry_id,
-                        mac,
-                        client,
-                        consider_home,
-                        router_device_info,
-                    )
-                )
-
-        if new_entities:
-            _LOGGER.debug("Adding %d new device trackers", len(new_entities))
-            async_add_entities(new_entities)
+        # In steady state every MAC is already tracked; bail out before
+        # materializing the set difference or building any entities
+        if tracked_macs.issuperset(clients.keys()):
+            return
+
+        new_macs = clients.keys() - tracked_macs
+        tracked_macs.update(new_macs)
+
+        new_entities = [
+            EdgeRouterDeviceTracker(
+                coordinator,
+                config_entry.entry_id,
+                mac,
+                clients[mac],
+                consider_home,
+                router_device_info,
+            )
+            for mac in new_macs
+        ]
+
+        _LOGGER.debug("Adding %d new device trackers", len(new_entities))
+        async_add_entities(new_entities)
 
     # Add entities for current data
     async_add_new_entities()
@@ -95,26 +100,34 @@ class EdgeRouterDeviceTracker(CoordinatorEntity, ScannerEntity):
         """Initialize the device tracker."""
         super().__init__(coordinator)
         self._mac = mac
-        self._consider_home = timedelta(seconds=consider_home)
+        self._consider_home_s = float(consider_home)
         self._entry_id = entry_id
         self._last_seen: datetime | None = client.last_seen
+        # Monotonic timestamp backing the consider_home window; only
+        # deltas matter, so avoid datetime arithmetic on every state read
+        self._last_seen_ts: float = time.monotonic() if client.in_arp else 0.0
         self._router_device_info = router_device_info
-        self._host = router_device_info.get("identifiers", set()).copy().pop()[1] if router_device_info.get("identifiers") else entry_id
+        identifiers = router_device_info.get("identifiers")
+        self._host = next(iter(identifiers))[1] if identifiers else entry_id
 
         # Create a device for each tracked client using MAC as connection identifier
         # This makes each tracked device appear as its own device in HA
         client_name = client.name if client.name and client.name != "?" else mac
         self._client_name = client_name
+        self._connections = {(CONNECTION_NETWORK_MAC, mac)}
+        self._via_device = (DOMAIN, self._host)  # Link to router device
         self._attr_device_info = DeviceInfo(
-            connections={(CONNECTION_NETWORK_MAC, mac)},
+            connections=self._connections,
             name=client_name,
-            via_device=(DOMAIN, self._host),  # Link to router device
+            via_device=self._via_device,
         )
 
         # Set entity properties
         self._attr_unique_id = f"{entry_id}_{mac.replace(':', '_')}"
         self._attr_name = None  # Use device name only
 
+        self._cached_attrs = self._build_attrs()
+
     @property
     def _client(self) -> ClientInfo | None:
         """Get the current client info."""
@@ -127,12 +140,12 @@ class EdgeRouterDeviceTracker(CoordinatorEntity, ScannerEntity):
         """Return true if the device is connected."""
         client = self._client
         if client and client.in_arp:
-            self._last_seen = client.last_seen
+            self._last_seen_ts = time.monotonic()
             return True
 
         # Check consider_home window
-        if self._last_seen and self._consider_home.total_seconds() > 0:
-            return datetime.now() - self._last_seen < self._consider_home
+        if self._last_seen_ts and self._consider_home_s > 0:
+            return time.monotonic() - self._last_seen_ts < self._consider_home_s
 
         return False
 
@@ -161,6 +174,10 @@ class EdgeRouterDeviceTracker(CoordinatorEntity, ScannerEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
+        return self._cached_attrs
+
+    def _build_attrs(self) -> dict[str, Any]:
+        """Build the state attributes for the current coordinator data."""
         attrs = {
             ATTR_MAC_ADDRESS: self._mac,
         }
@@ -197,13 +214,16 @@ class EdgeRouterDeviceTracker(CoordinatorEntity, ScannerEntity):
             if client.hostname and client.hostname != "?":
                 if self._client_name != client.hostname:
                     self._client_name = client.hostname
-                    self._attr_device_info = DeviceInfo(
-                        connections={(CONNECTION_NETWORK_MAC, self._mac)},
-                        name=client.hostname,
-                        via_device=(DOMAIN, self._host),
-                    )
+                    # DeviceInfo is a TypedDict, so update the name in place
+                    # rather than rebuilding the whole mapping
+                    self._attr_device_info["name"] = client.hostname
             # Update last seen if in ARP
             if client.in_arp:
                 self._last_seen = client.last_seen
+                self._last_seen_ts = time.monotonic()
+
+        # Attributes only change when the coordinator does, so rebuild the
+        # dict here instead of on every state read
+        self._cached_attrs = self._build_attrs()
 
         super()._handle_coordinator_update()
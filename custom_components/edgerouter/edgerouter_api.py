@@ -1,16 +1,41 @@
 """EdgeRouter API client."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
-from dataclasses import dataclass, field
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any
 
 import paramiko
+import requests
+import urllib3
 
 _LOGGER = logging.getLogger(__name__)
 
+# EdgeRouters ship with self-signed certificates, so the web API is used
+# with certificate verification disabled; silence the per-request warning
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# Sentinel echoed between batched commands so their outputs can be split apart
+_SPLIT_MARKER = "===EDGEROUTER-SPLIT==="
+
+# Sentinel echoed after a raw file read to prove the read succeeded
+_OK_MARKER = "===EDGEROUTER-OK==="
+
+# ISC dhcpd leases database on EdgeOS
+_DHCPD_LEASES_PATH = "/config/dhcpd.leases"
+
+# Kernel ARP table
+_PROC_ARP_PATH = "/proc/net/arp"
+
+# Precompiled patterns shared by the table parsers
+_MAC_RE = re.compile(r"(?:[0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}")
+_DATE_RE = re.compile(r"\d{4}/\d{2}/\d{2}")
+
 
 class EdgeRouterConnectionError(Exception):
     """Error connecting to EdgeRouter."""
@@ -20,7 +45,7 @@ class EdgeRouterAuthenticationError(EdgeRouterConnectionError):
     """Authentication error connecting to EdgeRouter."""
 
 
-@dataclass
+@dataclass(slots=True)
 class ClientInfo:
     """Information about a connected client."""
 
@@ -31,7 +56,7 @@ class ClientInfo:
     lease_expires: str | None = None
     in_arp: bool = False
     has_dhcp_lease: bool = False
-    last_seen: datetime = field(default_factory=datetime.now)
+    last_seen: datetime | None = None
 
     @property
     def name(self) -> str:
@@ -53,16 +78,46 @@ class EdgeRouterAPI:
         password: str,
         port: int = 22,
         timeout: int = 10,
+        stale_after: int = 0,
     ) -> None:
-        """Initialize the EdgeRouter API client."""
+        """Initialize the EdgeRouter API client.
+
+        stale_after is how many seconds a client absent from both the ARP
+        table and the DHCP leases is kept in the cache before eviction.
+        """
         self.host = host
         self.username = username
         self.password = password
         self.port = port
         self.timeout = timeout
+        self.stale_after = stale_after
+        self._clients: dict[str, ClientInfo] = {}
+        self._client: paramiko.SSHClient | None = None
+        self._lock = threading.Lock()
+        # Private single-worker executor so async callers serialize
+        # naturally instead of contending on a shared thread pool
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="edgerouter-ssh"
+        )
+        self._web: requests.Session | None = None
+        # None = not yet probed, False = probe failed, stick with SSH
+        self._web_available: bool | None = None
+        # None = not yet probed, False = unreadable, use `show dhcp leases`
+        self._dhcp_file_ok: bool | None = None
+        # None = not yet probed, False = unreadable, use `show arp`
+        self._arp_file_ok: bool | None = None
+        # Hardware model / firmware version; effectively static per session
+        self._system_info: dict[str, Any] | None = None
+
+    def _ensure_connected(self) -> paramiko.SSHClient:
+        """Return a connected SSH client, (re)connecting only when needed."""
+        if self._client is not None:
+            transport = self._client.get_transport()
+            if transport is not None and transport.is_active():
+                return self._client
+            # Connection went stale; drop it and dial again
+            self._close_client()
 
-    def _exec_command(self, command: str) -> str:
-        """Execute a command on the EdgeRouter via SSH."""
         client = paramiko.SSHClient()
         client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
@@ -76,50 +131,355 @@ class EdgeRouterAPI:
                 allow_agent=False,
                 look_for_keys=False,
             )
-            _LOGGER.debug("Connected to EdgeRouter at %s", self.host)
-
-            # EdgeOS requires commands to be run through the CLI wrapper
-            # Use /opt/vyatta/bin/vyatta-op-cmd-wrapper for operational commands
-            wrapped_command = f"/opt/vyatta/bin/vyatta-op-cmd-wrapper {command}"
-            stdin, stdout, stderr = client.exec_command(wrapped_command, timeout=self.timeout)
-            output = stdout.read().decode("utf-8")
-            error = stderr.read().decode("utf-8")
-
-            if error:
-                _LOGGER.warning("Command '%s' produced error: %s", command, error)
-
-            return output
-
         except paramiko.AuthenticationException as err:
+            client.close()
             raise EdgeRouterAuthenticationError(
                 f"Authentication failed for {self.username}@{self.host}"
             ) from err
         except paramiko.SSHException as err:
+            client.close()
             raise EdgeRouterConnectionError(
                 f"SSH error connecting to {self.host}: {err}"
             ) from err
         except TimeoutError as err:
+            client.close()
             raise EdgeRouterConnectionError(
                 f"Timeout connecting to {self.host}"
             ) from err
         except OSError as err:
+            client.close()
             raise EdgeRouterConnectionError(
                 f"Network error connecting to {self.host}: {err}"
             ) from err
-        finally:
-            client.close()
+
+        _LOGGER.debug("Connected to EdgeRouter at %s", self.host)
+        transport = client.get_transport()
+        if transport is not None:
+            # Keep the session alive between polls so it can be reused
+            transport.set_keepalive(30)
+        self._client = client
+        return client
+
+    def _close_client(self) -> None:
+        """Close and discard the cached SSH client."""
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            self._client = None
+
+    def __enter__(self) -> EdgeRouterAPI:
+        """Enter a context that shares one SSH session across calls."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Close the cached connections on context exit."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connections to the EdgeRouter."""
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            self._close_client()
+        self._close_web()
+
+    async def async_get_all_clients(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> dict[str, ClientInfo]:
+        """Fetch all clients on the API's own single-worker executor.
+
+        Routing the poll through a dedicated worker guarantees single-flight
+        access to the cached SSH transport even if a manual refresh overlaps
+        a scheduled one.
+        """
+        return await loop.run_in_executor(self._executor, self.get_all_clients)
+
+    def _close_web(self) -> None:
+        """Close and discard the cached web API session."""
+        if self._web is not None:
+            try:
+                self._web.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+            self._web = None
+
+    def _web_session(self) -> requests.Session:
+        """Return an authenticated web API session, logging in when needed."""
+        if self._web is None:
+            session = requests.Session()
+            session.verify = False
+            response = session.post(
+                f"https://{self.host}/api/edge/auth.json",
+                data={"username": self.username, "password": self.password},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            payload = response.json()
+            if str(payload.get("success")) not in ("1", "true", "True"):
+                session.close()
+                raise EdgeRouterAuthenticationError(
+                    f"Web API authentication failed for {self.username}@{self.host}"
+                )
+            _LOGGER.debug("Authenticated to EdgeOS web API at %s", self.host)
+            self._web = session
+        return self._web
+
+    def _web_get_data(self, key: str) -> Any:
+        """Fetch a structured data blob from the EdgeOS web API."""
+        session = self._web_session()
+        response = session.get(
+            f"https://{self.host}/api/edge/data.json",
+            params={"data": key},
+            timeout=self.timeout,
+        )
+        if response.status_code in (401, 403):
+            # Session cookie expired; log in again and retry once
+            self._close_web()
+            session = self._web_session()
+            response = session.get(
+                f"https://{self.host}/api/edge/data.json",
+                params={"data": key},
+                timeout=self.timeout,
+            )
+        response.raise_for_status()
+        payload = response.json()
+        if str(payload.get("success")) not in ("1", "true", "True"):
+            raise EdgeRouterConnectionError(
+                f"Web API request for '{key}' failed on {self.host}"
+            )
+        return payload.get("output")
+
+    @staticmethod
+    def _flatten_web_arp(output: Any) -> list[dict[str, str]]:
+        """Flatten the web API ARP blob into ARP entries.
+
+        Raises EdgeRouterConnectionError on an unrecognized payload shape
+        so the caller falls back to SSH instead of latching onto a web API
+        that silently yields no clients.
+        """
+        if not isinstance(output, list):
+            raise EdgeRouterConnectionError(
+                f"Unexpected web API ARP payload: {type(output).__name__}"
+            )
+        entries = []
+        for entry in output:
+            if not isinstance(entry, dict):
+                continue
+            mac = (entry.get("hwaddr") or "").lower()
+            if not mac or mac == "00:00:00:00:00:00":
+                continue
+            entries.append({
+                "ip": entry.get("ip", ""),
+                "mac": mac,
+                "interface": entry.get("intf", ""),
+            })
+        return entries
+
+    @staticmethod
+    def _flatten_web_dhcp(output: Any) -> list[dict[str, str]]:
+        """Flatten the web API DHCP leases blob into lease entries.
+
+        Raises EdgeRouterConnectionError on an unrecognized payload shape
+        so the caller falls back to SSH instead of latching onto a web API
+        that silently yields no clients.
+        """
+        if not isinstance(output, dict):
+            raise EdgeRouterConnectionError(
+                f"Unexpected web API DHCP payload: {type(output).__name__}"
+            )
+        pools = output.get("dhcp-server-leases") or {}
+        if not isinstance(pools, dict):
+            raise EdgeRouterConnectionError(
+                f"Unexpected web API DHCP pool table: {type(pools).__name__}"
+            )
+        leases = []
+        for pool in pools.values():
+            if not isinstance(pool, dict):
+                continue
+            for ip, lease in pool.items():
+                if not isinstance(lease, dict):
+                    continue
+                mac = (lease.get("mac") or "").lower()
+                if not mac:
+                    continue
+                hostname = lease.get("client-hostname") or None
+                if hostname == "?":
+                    hostname = None
+                leases.append({
+                    "ip": ip,
+                    "mac": mac,
+                    "hostname": hostname,
+                    "expires": lease.get("expiration"),
+                })
+        return leases
+
+    def _fetch_tables(self) -> tuple[list[dict[str, str]], list[dict[str, str]]]:
+        """Fetch the ARP and DHCP tables, preferring the web API over SSH.
+
+        The JSON-returning web API avoids both the SSH channel round trip
+        and all of the CLI text parsing. Routers without the web GUI
+        enabled fall back to the SSH path permanently for this session.
+        """
+        if self._web_available is not False:
+            try:
+                arp = self._flatten_web_arp(self._web_get_data("arp"))
+                dhcp = self._flatten_web_dhcp(self._web_get_data("dhcp_leases"))
+            except EdgeRouterAuthenticationError:
+                raise
+            except (requests.RequestException, ValueError, EdgeRouterConnectionError) as err:
+                _LOGGER.debug(
+                    "EdgeOS web API unavailable on %s, falling back to SSH: %s",
+                    self.host,
+                    err,
+                )
+                self._web_available = False
+                self._close_web()
+            else:
+                self._web_available = True
+                return arp, dhcp
+
+        arp_out, dhcp_out = self._exec_many([self._arp_command(), self._dhcp_command()])
+        return self._parse_arp_output(arp_out), self._parse_dhcp_output(dhcp_out)
+
+    def _arp_command(self) -> str:
+        """Return the command line that dumps the ARP table."""
+        if self._arp_file_ok is not False:
+            return f"cat {_PROC_ARP_PATH} && echo {_OK_MARKER}"
+        return self._wrap_op("show arp")
+
+    def _dhcp_command(self) -> str:
+        """Return the command line that dumps the DHCP leases."""
+        if self._dhcp_file_ok is not False:
+            return self._dhcp_file_command()
+        return self._wrap_op("show dhcp leases")
+
+    def _parse_arp_output(self, output: str) -> list[dict[str, str]]:
+        """Interpret the output of _arp_command, tracking file availability."""
+        if self._arp_file_ok is not False:
+            if output.rstrip().endswith(_OK_MARKER):
+                self._arp_file_ok = True
+                return self._parse_proc_arp(output)
+            _LOGGER.debug(
+                "Cannot read %s on %s, falling back to 'show arp'",
+                _PROC_ARP_PATH,
+                self.host,
+            )
+            self._arp_file_ok = False
+            output = self._exec_op("show arp")
+        return self._parse_arp(output)
+
+    def _parse_dhcp_output(self, output: str) -> list[dict[str, str]]:
+        """Interpret the output of _dhcp_command, tracking file availability."""
+        if self._dhcp_file_ok is not False:
+            if output.rstrip().endswith(_OK_MARKER):
+                self._dhcp_file_ok = True
+                return self._parse_leases_file(output)
+            _LOGGER.debug(
+                "Cannot read %s on %s, falling back to 'show dhcp leases'",
+                _DHCPD_LEASES_PATH,
+                self.host,
+            )
+            self._dhcp_file_ok = False
+            output = self._exec_op("show dhcp leases")
+        return self._parse_dhcp(output)
+
+    @staticmethod
+    def _wrap_op(command: str) -> str:
+        """Wrap an operational-mode command through the EdgeOS CLI wrapper."""
+        # EdgeOS requires operational commands to be run through
+        # /opt/vyatta/bin/vyatta-op-cmd-wrapper
+        return f"/opt/vyatta/bin/vyatta-op-cmd-wrapper {command}"
+
+    def _exec_op(self, command: str) -> str:
+        """Execute an operational-mode command on the EdgeRouter via SSH."""
+        return self._run(self._wrap_op(command), command)
+
+    def _exec_raw(self, command: str) -> str:
+        """Execute a command directly, without the CLI wrapper spawn."""
+        return self._run(command, command)
+
+    def _exec_many(self, commands: list[str]) -> list[str]:
+        """Execute several prepared command lines in one SSH round trip.
+
+        The commands (already wrapped by the caller where needed) are joined
+        with a sentinel echo and the combined output is split back apart, so
+        the caller gets one output string per command for the cost of a
+        single channel.
+        """
+        combined = f"; echo '{_SPLIT_MARKER}'; ".join(commands)
+        output = self._run(combined, combined)
+        sections = output.split(f"{_SPLIT_MARKER}\n")
+        if len(sections) != len(commands):
+            raise EdgeRouterConnectionError(
+                f"Expected {len(commands)} command outputs from {self.host}, "
+                f"got {len(sections)}"
+            )
+        return sections
+
+    def _run(self, wrapped_command: str, command: str) -> str:
+        """Run a prepared command line over the cached SSH connection."""
+        with self._lock:
+            # The cached connection may have been dropped by the router since
+            # the last poll; retry once on a fresh connection before giving up.
+            for attempt in (1, 2):
+                client = self._ensure_connected()
+                try:
+                    stdin, stdout, stderr = client.exec_command(
+                        wrapped_command, timeout=self.timeout
+                    )
+                    output = stdout.read().decode("utf-8", errors="replace")
+                    # Only pay for the stderr read/decode when the command
+                    # actually wrote something there (the uncommon case)
+                    channel = stdout.channel
+                    if channel.recv_exit_status() != 0 or channel.recv_stderr_ready():
+                        error = stderr.read().decode("utf-8", errors="replace")
+                    else:
+                        error = ""
+                except (paramiko.SSHException, EOFError) as err:
+                    self._close_client()
+                    if attempt == 2:
+                        raise EdgeRouterConnectionError(
+                            f"SSH error executing command on {self.host}: {err}"
+                        ) from err
+                    _LOGGER.debug(
+                        "Stale connection to %s, reconnecting: %s", self.host, err
+                    )
+                    continue
+                except OSError as err:
+                    self._close_client()
+                    raise EdgeRouterConnectionError(
+                        f"Network error communicating with {self.host}: {err}"
+                    ) from err
+
+                if error:
+                    _LOGGER.warning("Command '%s' produced error: %s", command, error)
+
+                return output
+
+        raise EdgeRouterConnectionError(f"Failed to execute command on {self.host}")
 
     def test_connection(self) -> bool:
         """Test the connection to the EdgeRouter."""
         try:
-            self._exec_command("show version")
+            self._exec_op("show version")
             return True
         except EdgeRouterConnectionError:
             return False
 
     def get_system_info(self) -> dict[str, Any]:
-        """Get system information from the EdgeRouter."""
-        output = self._exec_command("show version")
+        """Get system information from the EdgeRouter.
+
+        The hardware model and firmware version cannot change mid-session,
+        so the first result is cached on the instance.
+        """
+        if self._system_info is None:
+            self._system_info = self._parse_system_info(self._exec_op("show version"))
+        return self._system_info
+
+    @staticmethod
+    def _parse_system_info(output: str) -> dict[str, Any]:
+        """Parse `show version` output into a system info dict."""
         info = {}
 
         for line in output.strip().split("\n"):
@@ -129,9 +489,63 @@ class EdgeRouterAPI:
 
         return info
 
+    def get_bundle(self) -> dict[str, Any]:
+        """Fetch system info, the ARP table and DHCP leases in one round trip.
+
+        Saves the per-command shell spawn and channel latency for callers
+        that want all three datasets at once, such as the test script.
+        """
+        if self._system_info is None:
+            version_out, arp_out, dhcp_out = self._exec_many(
+                [self._wrap_op("show version"), self._arp_command(), self._dhcp_command()]
+            )
+            self._system_info = self._parse_system_info(version_out)
+        else:
+            arp_out, dhcp_out = self._exec_many(
+                [self._arp_command(), self._dhcp_command()]
+            )
+        return {
+            "system_info": self._system_info,
+            "arp": self._parse_arp_output(arp_out),
+            "dhcp": self._parse_dhcp_output(dhcp_out),
+        }
+
     def get_arp_table(self) -> list[dict[str, str]]:
-        """Get the ARP table from the EdgeRouter."""
-        output = self._exec_command("show arp")
+        """Get the ARP table from the EdgeRouter.
+
+        /proc/net/arp is read directly where possible, skipping both the
+        CLI wrapper spawn and the `show arp` pretty-printer; routers where
+        the read fails fall back to the CLI for the session.
+        """
+        return self._parse_arp_output(self._exec_raw(self._arp_command()))
+
+    @staticmethod
+    def _parse_proc_arp(output: str) -> list[dict[str, str]]:
+        """Parse /proc/net/arp into ARP entries."""
+        entries = []
+
+        # Header: IP address  HW type  Flags  HW address  Mask  Device
+        for line in output.splitlines()[1:]:
+            parts = line.split(None, 5)
+            if len(parts) < 6:
+                continue
+            ip, _hw_type, flags, mac, _mask, device = parts
+            # Incomplete entries carry flags 0x0 and an all-zero MAC; the
+            # column layout is fixed, so no regex validation is needed
+            if flags == "0x0" or mac == "00:00:00:00:00:00":
+                continue
+            entries.append({
+                "ip": ip,
+                "mac": mac.lower(),
+                "interface": device.strip(),
+            })
+
+        _LOGGER.debug("Parsed %d ARP entries", len(entries))
+        return entries
+
+    @staticmethod
+    def _parse_arp(output: str) -> list[dict[str, str]]:
+        """Parse `show arp` output into ARP entries."""
         entries = []
 
         _LOGGER.debug("ARP table output:\n%s", output)
@@ -145,17 +559,19 @@ class EdgeRouterAPI:
             # Parse ARP entry - format varies but typically:
             # IP address       HW type     Flags       HW address            Mask     Device
             # Or: IP (incomplete) on interface
-            parts = line.split()
+            # Capped split: only the leading field and a length check are
+            # needed, so don't tokenize the whole line
+            parts = line.split(None, 3)
             if len(parts) >= 4:
-                ip = parts[0]
                 # Look for MAC address pattern
-                mac_pattern = r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}"
-                mac_match = re.search(mac_pattern, line)
+                mac_match = _MAC_RE.search(line)
                 if mac_match:
                     mac = mac_match.group(0).lower().replace("-", ":")
-                    interface = parts[-1] if len(parts) > 4 else ""
+                    # Interface is the trailing field on full-width rows
+                    tail = line[mac_match.end():].split()
+                    interface = tail[-1] if len(tail) >= 2 else ""
                     entries.append({
-                        "ip": ip,
+                        "ip": parts[0],
                         "mac": mac,
                         "interface": interface,
                     })
@@ -164,8 +580,79 @@ class EdgeRouterAPI:
         return entries
 
     def get_dhcp_leases(self) -> list[dict[str, str]]:
-        """Get DHCP leases from the EdgeRouter."""
-        output = self._exec_command("show dhcp leases")
+        """Get DHCP leases from the EdgeRouter.
+
+        Reading the ISC leases database directly costs the router almost
+        nothing, while `show dhcp leases` spawns a Perl pretty-printer that
+        parses the same file on every call. Routers where the file cannot
+        be read fall back to the CLI permanently for this session.
+        """
+        return self._parse_dhcp_output(self._exec_raw(self._dhcp_command()))
+
+    @staticmethod
+    def _dhcp_file_command() -> str:
+        """Return the raw command that dumps the leases file."""
+        # The trailing echo only fires when the read succeeds, which is how
+        # the caller distinguishes an empty file from a permission failure
+        return f"cat {_DHCPD_LEASES_PATH} && echo {_OK_MARKER}"
+
+    @staticmethod
+    def _parse_leases_file(output: str) -> list[dict[str, str]]:
+        """Parse the ISC dhcpd leases database into lease entries.
+
+        Later blocks for the same IP supersede earlier ones, and only
+        leases whose final binding state is active are reported, matching
+        what `show dhcp leases` displays.
+        """
+        leases: dict[str, dict[str, str | None]] = {}
+        lease: dict[str, str | None] | None = None
+        state = "active"
+
+        for raw_line in output.splitlines():
+            line = raw_line.strip()
+            if line.startswith("lease ") and line.endswith("{"):
+                lease = {
+                    "ip": line.split(None, 2)[1],
+                    "mac": None,
+                    "hostname": None,
+                    "expires": None,
+                }
+                state = "active"
+            elif lease is None:
+                continue
+            elif line.startswith("hardware ethernet "):
+                lease["mac"] = line[18:].rstrip(";").lower()
+            elif line.startswith("client-hostname "):
+                hostname = line[16:].rstrip(";").strip('"')
+                lease["hostname"] = hostname if hostname != "?" else None
+            elif line.startswith("binding state "):
+                state = line[14:].rstrip(";")
+            elif line.startswith("ends "):
+                # e.g. `ends 3 2024/05/01 12:34:56;` or `ends never;`
+                fields = line.rstrip(";").split()
+                if len(fields) >= 4:
+                    lease["expires"] = f"{fields[2]} {fields[3]}"
+                elif len(fields) >= 2:
+                    lease["expires"] = fields[1]
+            elif line.startswith("}"):
+                ip = lease["ip"]
+                if lease["mac"]:
+                    if state == "active":
+                        # Renewal blocks often omit the hostname; keep the
+                        # one recorded by the superseded block
+                        previous = leases.get(ip)
+                        if previous is not None and lease["hostname"] is None:
+                            lease["hostname"] = previous["hostname"]
+                        leases[ip] = lease
+                    else:
+                        leases.pop(ip, None)
+                lease = None
+
+        return list(leases.values())
+
+    @staticmethod
+    def _parse_dhcp(output: str) -> list[dict[str, str]]:
+        """Parse `show dhcp leases` output into lease entries."""
         leases = []
 
         _LOGGER.debug("DHCP leases output:\n%s", output)
@@ -185,28 +672,27 @@ class EdgeRouterAPI:
 
             # Parse DHCP lease - format typically:
             # IP address      Hardware Address   Lease expiration     Pool       Client Name
-            parts = line.split()
+            # Capped split: only the leading field and a length check are needed
+            parts = line.split(None, 2)
             if len(parts) >= 3:
                 ip = parts[0]
-                mac_pattern = r"([0-9a-fA-F]{2}[:-]){5}[0-9a-fA-F]{2}"
-                mac_match = re.search(mac_pattern, line)
+                mac_match = _MAC_RE.search(line)
 
                 if mac_match:
                     mac = mac_match.group(0).lower().replace("-", ":")
 
                     # Try to extract hostname (usually last field or before pool name)
                     hostname = None
-                    # Look for hostname after lease expiration
+                    # Look for hostname after lease expiration; skip the
+                    # date/time and pool fields, hostname is often last
                     remaining = line[mac_match.end():].strip()
-                    remaining_parts = remaining.split()
-                    if len(remaining_parts) >= 3:
-                        # Skip date/time and pool name, hostname is often last
-                        hostname = remaining_parts[-1] if remaining_parts[-1] != "?" else None
+                    if len(remaining.split(None, 2)) >= 3:
+                        tail = remaining.rsplit(None, 1)[-1]
+                        hostname = tail if tail != "?" else None
 
                     # Extract expiration info
                     expires = None
-                    date_pattern = r"\d{4}/\d{2}/\d{2}"
-                    date_match = re.search(date_pattern, remaining)
+                    date_match = _DATE_RE.search(remaining)
                     if date_match:
                         expires = remaining[date_match.start():date_match.start() + 19]
 
@@ -221,39 +707,57 @@ class EdgeRouterAPI:
         return leases
 
     def get_all_clients(self) -> dict[str, ClientInfo]:
-        """Get all connected clients by combining ARP and DHCP data."""
-        clients: dict[str, ClientInfo] = {}
+        """Get all connected clients by combining ARP and DHCP data.
+
+        The client dict persists across polls: existing ClientInfo entries
+        are mutated in place rather than reallocated, and clients absent
+        from both tables are evicted once they age past stale_after.
+        """
+        clients = self._clients
         now = datetime.now()
 
-        # Get ARP entries
-        try:
-            arp_entries = self.get_arp_table()
-            for entry in arp_entries:
-                mac = entry["mac"]
-                if mac not in clients:
-                    clients[mac] = ClientInfo(mac=mac)
-                clients[mac].ip = entry["ip"]
-                clients[mac].interface = entry.get("interface")
-                clients[mac].in_arp = True
-                clients[mac].last_seen = now
-        except Exception as err:
-            _LOGGER.error("Error getting ARP table: %s", err)
-
-        # Get DHCP leases
-        try:
-            dhcp_leases = self.get_dhcp_leases()
-            for lease in dhcp_leases:
-                mac = lease["mac"]
-                if mac not in clients:
-                    clients[mac] = ClientInfo(mac=mac)
-                    clients[mac].ip = lease["ip"]
-                clients[mac].hostname = lease.get("hostname")
-                clients[mac].lease_expires = lease.get("expires")
-                clients[mac].has_dhcp_lease = True
-                if clients[mac].in_arp:
-                    clients[mac].last_seen = now
-        except Exception as err:
-            _LOGGER.error("Error getting DHCP leases: %s", err)
+        arp_entries, dhcp_leases = self._fetch_tables()
+
+        # Clear the transient flags before repopulating from this poll
+        for client in clients.values():
+            client.in_arp = False
+            client.has_dhcp_lease = False
+
+        # Merge ARP entries
+        for entry in arp_entries:
+            mac = entry["mac"]
+            client = clients.get(mac)
+            if client is None:
+                client = clients[mac] = ClientInfo(mac=mac)
+            client.ip = entry["ip"]
+            client.interface = entry.get("interface")
+            client.in_arp = True
+            client.last_seen = now
+
+        # Merge DHCP leases
+        for lease in dhcp_leases:
+            mac = lease["mac"]
+            client = clients.get(mac)
+            if client is None:
+                client = clients[mac] = ClientInfo(mac=mac)
+                client.ip = lease["ip"]
+            client.hostname = lease.get("hostname")
+            client.lease_expires = lease.get("expires")
+            client.has_dhcp_lease = True
+            if client.in_arp:
+                client.last_seen = now
+
+        # Evict clients gone from both tables for longer than stale_after
+        cutoff = now - timedelta(seconds=self.stale_after)
+        stale = [
+            mac
+            for mac, client in clients.items()
+            if not client.in_arp
+            and not client.has_dhcp_lease
+            and (client.last_seen is None or client.last_seen < cutoff)
+        ]
+        for mac in stale:
+            del clients[mac]
 
         _LOGGER.info("Found %d unique clients", len(clients))
         return clients
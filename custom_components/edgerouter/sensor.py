@@ -2,23 +2,19 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from . import EdgeRouterCoordinator
 from .const import DOMAIN
-from .edgerouter_api import ClientInfo
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,7 +26,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up sensors for EdgeRouter."""
     data = hass.data[DOMAIN][config_entry.entry_id]
-    coordinator: DataUpdateCoordinator = data["coordinator"]
+    coordinator: EdgeRouterCoordinator = data["coordinator"]
     device_info: DeviceInfo = data["device_info"]
 
     async_add_entities([
@@ -40,7 +36,7 @@ async def async_setup_entry(
     ])
 
 
-class EdgeRouterBaseSensor(CoordinatorEntity, SensorEntity):
+class EdgeRouterBaseSensor(CoordinatorEntity[EdgeRouterCoordinator], SensorEntity):
     """Base class for EdgeRouter sensors."""
 
     _attr_has_entity_name = True
@@ -48,7 +44,7 @@ class EdgeRouterBaseSensor(CoordinatorEntity, SensorEntity):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EdgeRouterCoordinator,
         entry_id: str,
         device_info: DeviceInfo,
     ) -> None:
@@ -57,6 +53,18 @@ class EdgeRouterBaseSensor(CoordinatorEntity, SensorEntity):
         self._entry_id = entry_id
         self._attr_device_info = device_info
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # The state only changes when the coordinator does, so compute it
+        # once per update instead of on every property read
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
+
+    def _update_from_coordinator(self) -> None:
+        """Recompute the cached state from coordinator data."""
+        raise NotImplementedError
+
 
 class EdgeRouterConnectedClientsSensor(EdgeRouterBaseSensor):
     """Sensor for total connected clients count."""
@@ -66,7 +74,7 @@ class EdgeRouterConnectedClientsSensor(EdgeRouterBaseSensor):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EdgeRouterCoordinator,
         entry_id: str,
         device_info: DeviceInfo,
     ) -> None:
@@ -74,26 +82,12 @@ class EdgeRouterConnectedClientsSensor(EdgeRouterBaseSensor):
         super().__init__(coordinator, entry_id, device_info)
         self._attr_unique_id = f"{entry_id}_connected_clients"
         self._attr_name = "Connected clients"
+        self._update_from_coordinator()
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of connected clients."""
-        if self.coordinator.data:
-            clients: dict[str, ClientInfo] = self.coordinator.data
-            # Count clients that are in the ARP table (actually connected)
-            return sum(1 for c in clients.values() if c.in_arp)
-        return 0
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        clients: dict[str, ClientInfo] = self.coordinator.data
-        connected = [c for c in clients.values() if c.in_arp]
-
-        return {
+    def _update_from_coordinator(self) -> None:
+        """Recompute the cached state from coordinator data."""
+        self._attr_native_value = self.coordinator.connected_count
+        self._attr_extra_state_attributes = {
             "clients": [
                 {
                     "mac": c.mac,
@@ -101,7 +95,7 @@ class EdgeRouterConnectedClientsSensor(EdgeRouterBaseSensor):
                     "hostname": c.hostname,
                     "interface": c.interface,
                 }
-                for c in connected
+                for c in self.coordinator.connected_list
             ]
         }
 
@@ -114,7 +108,7 @@ class EdgeRouterArpClientsSensor(EdgeRouterBaseSensor):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EdgeRouterCoordinator,
         entry_id: str,
         device_info: DeviceInfo,
     ) -> None:
@@ -122,14 +116,11 @@ class EdgeRouterArpClientsSensor(EdgeRouterBaseSensor):
         super().__init__(coordinator, entry_id, device_info)
         self._attr_unique_id = f"{entry_id}_arp_entries"
         self._attr_name = "ARP entries"
+        self._update_from_coordinator()
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of ARP entries."""
-        if self.coordinator.data:
-            clients: dict[str, ClientInfo] = self.coordinator.data
-            return sum(1 for c in clients.values() if c.in_arp)
-        return 0
+    def _update_from_coordinator(self) -> None:
+        """Recompute the cached state from coordinator data."""
+        self._attr_native_value = self.coordinator.arp_count
 
 
 class EdgeRouterDhcpLeasesSensor(EdgeRouterBaseSensor):
@@ -140,7 +131,7 @@ class EdgeRouterDhcpLeasesSensor(EdgeRouterBaseSensor):
 
     def __init__(
         self,
-        coordinator: DataUpdateCoordinator,
+        coordinator: EdgeRouterCoordinator,
         entry_id: str,
         device_info: DeviceInfo,
     ) -> None:
@@ -148,25 +139,12 @@ class EdgeRouterDhcpLeasesSensor(EdgeRouterBaseSensor):
         super().__init__(coordinator, entry_id, device_info)
         self._attr_unique_id = f"{entry_id}_dhcp_leases"
         self._attr_name = "DHCP leases"
+        self._update_from_coordinator()
 
-    @property
-    def native_value(self) -> int:
-        """Return the number of DHCP leases."""
-        if self.coordinator.data:
-            clients: dict[str, ClientInfo] = self.coordinator.data
-            return sum(1 for c in clients.values() if c.has_dhcp_lease)
-        return 0
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes."""
-        if not self.coordinator.data:
-            return {}
-
-        clients: dict[str, ClientInfo] = self.coordinator.data
-        leases = [c for c in clients.values() if c.has_dhcp_lease]
-
-        return {
+    def _update_from_coordinator(self) -> None:
+        """Recompute the cached state from coordinator data."""
+        self._attr_native_value = self.coordinator.dhcp_count
+        self._attr_extra_state_attributes = {
             "leases": [
                 {
                     "mac": c.mac,
@@ -174,6 +152,6 @@ class EdgeRouterDhcpLeasesSensor(EdgeRouterBaseSensor):
                     "hostname": c.hostname,
                     "expires": c.lease_expires,
                 }
-                for c in leases
+                for c in self.coordinator.dhcp_list
             ]
         }
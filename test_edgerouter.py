@@ -15,31 +15,63 @@ Example:
 """
 
 import argparse
-import getpass
-import importlib.util
 import sys
-from datetime import datetime
+import traceback
 from pathlib import Path
 
-# Load the edgerouter_api module directly from the custom_components package
-# This tests the actual library code without requiring Home Assistant dependencies
-_api_path = Path(__file__).parent / "custom_components" / "edgerouter" / "edgerouter_api.py"
-_spec = importlib.util.spec_from_file_location("edgerouter_api", _api_path)
-_module = importlib.util.module_from_spec(_spec)
-sys.modules["edgerouter_api"] = _module
-_spec.loader.exec_module(_module)
+# Import edgerouter_api from the custom_components package via a normal
+# sys.path import so the standard loader (and its bytecode cache) is used.
+# This still tests the actual library code without requiring Home Assistant
+# dependencies.
+sys.path.insert(0, str(Path(__file__).parent / "custom_components" / "edgerouter"))
 
-EdgeRouterAPI = _module.EdgeRouterAPI
-EdgeRouterAuthenticationError = _module.EdgeRouterAuthenticationError
-EdgeRouterConnectionError = _module.EdgeRouterConnectionError
+from edgerouter_api import (  # noqa: E402
+    EdgeRouterAPI,
+    EdgeRouterAuthenticationError,
+    EdgeRouterConnectionError,
+)
+
+# Translation table for turning device names into entity-id slugs
+_SLUG_TBL = str.maketrans({" ": "_", ".": "_", ":": "_"})
+
+
+# Fixed box-art pieces for the device preview, built once
+_BOX_BOTTOM = "  └" + "─" * 58
+_BOX_DIV = "  " + "─" * 59
+
+# Section header rule and the startup banner, built once
+_RULE = "=" * 60
+_BANNER = "\n".join((
+    "",
+    "╔══════════════════════════════════════════════════════════╗",
+    "║         EdgeRouter Integration Test Script               ║",
+    "╚══════════════════════════════════════════════════════════╝",
+    "",
+))
+
+
+def _ip_key(item) -> str:
+    """Sort key: client IP with empty-string fallback."""
+    return item[1].ip or ""
+
+
+def _name_key(item) -> str:
+    """Sort key: client display name."""
+    return item[1].name
+
+
+def _conn_type(client) -> str:
+    """Return the connection-type label for a client."""
+    if client.in_arp and client.has_dhcp_lease:
+        return "dhcp"
+    if client.in_arp:
+        return "static"
+    return "dhcp_inactive"
 
 
 def print_header(title: str) -> None:
     """Print a formatted header."""
-    print()
-    print("=" * 60)
-    print(f" {title}")
-    print("=" * 60)
+    print(f"\n{_RULE}\n {title}\n{_RULE}")
 
 
 def print_table(headers: list[str], rows: list[list[str]]) -> None:
@@ -48,22 +80,20 @@ def print_table(headers: list[str], rows: list[list[str]]) -> None:
         print("  (no data)")
         return
 
-    # Calculate column widths
+    # Stringify each cell once, while calculating column widths
+    str_rows = [[str(cell) for cell in row] for row in rows]
     widths = [len(h) for h in headers]
-    for row in rows:
+    for row in str_rows:
         for i, cell in enumerate(row):
             if i < len(widths):
-                widths[i] = max(widths[i], len(str(cell)))
-
-    # Print header
-    header_line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
-    print(f"  {header_line}")
-    print("  " + "  ".join("-" * w for w in widths))
+                widths[i] = max(widths[i], len(cell))
 
-    # Print rows
-    for row in rows:
-        row_line = "  ".join(str(cell).ljust(widths[i]) for i, cell in enumerate(row))
-        print(f"  {row_line}")
+    # One format template replaces the per-cell ljust calls, and the whole
+    # table goes out in a single write
+    fmt = "  " + "  ".join(f"{{:<{w}}}" for w in widths)
+    lines = [fmt.format(*headers), "  " + "  ".join("-" * w for w in widths)]
+    lines.extend(fmt.format(*row) for row in str_rows)
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def test_connection(api: EdgeRouterAPI) -> bool:
@@ -85,56 +115,38 @@ def test_connection(api: EdgeRouterAPI) -> bool:
         return False
 
 
-def test_system_info(api: EdgeRouterAPI) -> None:
-    """Test getting system information."""
+def test_system_info(info: dict) -> None:
+    """Display the already-fetched system information."""
     print_header("System Information")
-    try:
-        info = api.get_system_info()
-        for key, value in info.items():
-            print(f"  {key}: {value}")
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
+    for key, value in info.items():
+        print(f"  {key}: {value}")
 
 
-def test_arp_table(api: EdgeRouterAPI) -> list:
-    """Test getting ARP table."""
+def test_arp_table(entries: list) -> None:
+    """Display the already-fetched ARP table."""
     print_header("ARP Table")
-    try:
-        entries = api.get_arp_table()
-        rows = [[e["ip"], e["mac"], e.get("interface", "")] for e in entries]
-        print_table(["IP Address", "MAC Address", "Interface"], rows)
-        print(f"\n  Total ARP entries: {len(entries)}")
-        return entries
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return []
+    rows = [[e["ip"], e["mac"], e.get("interface", "")] for e in entries]
+    print_table(["IP Address", "MAC Address", "Interface"], rows)
+    print(f"\n  Total ARP entries: {len(entries)}")
 
 
-def test_dhcp_leases(api: EdgeRouterAPI) -> list:
-    """Test getting DHCP leases."""
+def test_dhcp_leases(leases: list) -> None:
+    """Display the already-fetched DHCP leases."""
     print_header("DHCP Leases")
-    try:
-        leases = api.get_dhcp_leases()
-        rows = [
-            [lease["ip"], lease["mac"], lease.get("hostname") or "", lease.get("expires") or ""]
-            for lease in leases
-        ]
-        print_table(["IP Address", "MAC Address", "Hostname", "Expires"], rows)
-        print(f"\n  Total DHCP leases: {len(leases)}")
-        return leases
-    except Exception as e:
-        print(f"  ❌ Error: {e}")
-        return []
+    rows = [
+        [lease["ip"], lease["mac"], lease.get("hostname") or "", lease.get("expires") or ""]
+        for lease in leases
+    ]
+    print_table(["IP Address", "MAC Address", "Hostname", "Expires"], rows)
+    print(f"\n  Total DHCP leases: {len(leases)}")
 
 
-def test_all_clients(api: EdgeRouterAPI) -> None:
-    """Test getting all clients (combined ARP + DHCP)."""
+def test_all_clients(clients: dict) -> None:
+    """Display the already-fetched combined ARP + DHCP clients."""
     print_header("All Connected Clients")
     try:
-        clients = api.get_all_clients()
-
         rows = []
-        for mac, client in sorted(clients.items(), key=lambda x: x[1].ip or ""):
+        for mac, client in sorted(clients.items(), key=_ip_key):
             status = []
             if client.in_arp:
                 status.append("ARP")
@@ -154,87 +166,112 @@ def test_all_clients(api: EdgeRouterAPI) -> None:
             rows,
         )
 
-        # Summary
-        arp_count = sum(1 for c in clients.values() if c.in_arp)
-        dhcp_count = sum(1 for c in clients.values() if c.has_dhcp_lease)
-        both_count = sum(1 for c in clients.values() if c.in_arp and c.has_dhcp_lease)
-
-        print("\n  Summary:")
-        print(f"    Total unique clients: {len(clients)}")
-        print(f"    In ARP table (connected): {arp_count}")
-        print(f"    Have DHCP lease: {dhcp_count}")
-        print(f"    Both ARP and DHCP: {both_count}")
+        # Summary, accumulated in a single pass over the clients
+        arp_count = dhcp_count = both_count = 0
+        for c in clients.values():
+            in_arp, has_dhcp = c.in_arp, c.has_dhcp_lease
+            arp_count += in_arp
+            dhcp_count += has_dhcp
+            both_count += in_arp and has_dhcp
+
+        sys.stdout.write(
+            "\n".join([
+                "",
+                "  Summary:",
+                f"    Total unique clients: {len(clients)}",
+                f"    In ARP table (connected): {arp_count}",
+                f"    Have DHCP lease: {dhcp_count}",
+                f"    Both ARP and DHCP: {both_count}",
+            ])
+            + "\n"
+        )
 
     except Exception as e:
         print(f"  ❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 
-def test_home_assistant_devices(api: EdgeRouterAPI, host: str) -> None:
+def test_home_assistant_devices(host: str, clients: dict, system_info: dict) -> None:
     """Show how devices will appear in Home Assistant."""
     print_header("Home Assistant Device Preview")
 
     try:
-        system_info = api.get_system_info()
-        clients = api.get_all_clients()
+        if not sys.stdout.isatty():
+            # The box art is only worth the bytes on a human terminal;
+            # emit a compact machine-readable form when piped/redirected
+            lines = ["mac,ip,hostname,state,conn_type"]
+            items = list(clients.items())
+            items.sort(key=_name_key)
+            for mac, client in items:
+                state = "home" if client.in_arp else "not_home"
+                hostname = client.hostname if client.hostname and client.hostname != "?" else ""
+                lines.append(
+                    f"{mac},{client.ip or ''},{hostname},{state},{_conn_type(client)}"
+                )
+            sys.stdout.write("\n".join(lines) + "\n")
+            return
+
+        # Build the whole section in memory and emit it with one write
+        # instead of a couple of syscalls per client device
+        buf: list[str] = []
 
         # Router device
-        print("\n  ┌─────────────────────────────────────────────────────────┐")
-        print("  │  ROUTER DEVICE (Parent)                                 │")
-        print("  ├─────────────────────────────────────────────────────────┤")
-        print(f"  │  Name:         EdgeRouter ({host})")
-        print("  │  Manufacturer: Ubiquiti")
-        print(f"  │  Model:        {system_info.get('hw_model', 'EdgeRouter')}")
-        print(f"  │  SW Version:   {system_info.get('version', 'Unknown')}")
-        print(f"  │  Identifier:   (edgerouter, {host})")
-        print("  │")
-        print("  │  Entities:")
-        print(f"  │    • sensor.edgerouter_{host.replace('.', '_')}_connected_clients")
-        print(f"  │    • sensor.edgerouter_{host.replace('.', '_')}_arp_entries")
-        print(f"  │    • sensor.edgerouter_{host.replace('.', '_')}_dhcp_leases")
-        print("  └─────────────────────────────────────────────────────────┘")
+        buf.append("\n  ┌─────────────────────────────────────────────────────────┐")
+        buf.append("  │  ROUTER DEVICE (Parent)                                 │")
+        buf.append("  ├─────────────────────────────────────────────────────────┤")
+        buf.append(f"  │  Name:         EdgeRouter ({host})")
+        buf.append("  │  Manufacturer: Ubiquiti")
+        buf.append(f"  │  Model:        {system_info.get('hw_model', 'EdgeRouter')}")
+        buf.append(f"  │  SW Version:   {system_info.get('version', 'Unknown')}")
+        buf.append(f"  │  Identifier:   (edgerouter, {host})")
+        buf.append("  │")
+        buf.append("  │  Entities:")
+        host_slug = host.replace(".", "_")
+        buf.append(f"  │    • sensor.edgerouter_{host_slug}_connected_clients")
+        buf.append(f"  │    • sensor.edgerouter_{host_slug}_arp_entries")
+        buf.append(f"  │    • sensor.edgerouter_{host_slug}_dhcp_leases")
+        buf.append("  └─────────────────────────────────────────────────────────┘")
 
         # Client devices
-        print("\n  CLIENT DEVICES (Children - linked via router):")
-        print("  " + "─" * 59)
+        buf.append("\n  CLIENT DEVICES (Children - linked via router):")
+        buf.append(_BOX_DIV)
+
+        # Invariant per-client line, formatted once outside the loop
+        via_line = f"  │  Via Device:   EdgeRouter ({host})"
 
-        for mac, client in sorted(clients.items(), key=lambda x: x[1].name):
+        items = list(clients.items())
+        items.sort(key=_name_key)
+        for mac, client in items:
             device_name = client.name
             state = "home" if client.in_arp else "not_home"
             state_icon = "🏠" if client.in_arp else "🚪"
-
-            # Connection type
-            if client.in_arp and client.has_dhcp_lease:
-                conn_type = "dhcp"
-            elif client.in_arp:
-                conn_type = "static"
-            else:
-                conn_type = "dhcp_inactive"
-
-            print(f"\n  ┌─ {device_name}")
-            print(f"  │  Connection:   (mac, {mac})")
-            print(f"  │  Via Device:   EdgeRouter ({host})")
-            print("  │")
-            print(f"  │  Entity: device_tracker.{device_name.lower().replace(' ', '_').replace('.', '_').replace(':', '_')}")
-            print(f"  │    State:      {state_icon} {state}")
-            print(f"  │    MAC:        {mac}")
+            conn_type = _conn_type(client)
+
+            buf.append(f"\n  ┌─ {device_name}")
+            buf.append(f"  │  Connection:   (mac, {mac})")
+            buf.append(via_line)
+            buf.append("  │")
+            buf.append(f"  │  Entity: device_tracker.{device_name.lower().translate(_SLUG_TBL)}")
+            buf.append(f"  │    State:      {state_icon} {state}")
+            buf.append(f"  │    MAC:        {mac}")
             if client.ip:
-                print(f"  │    IP:         {client.ip}")
+                buf.append(f"  │    IP:         {client.ip}")
             if client.hostname and client.hostname != "?":
-                print(f"  │    Hostname:   {client.hostname}")
+                buf.append(f"  │    Hostname:   {client.hostname}")
             if client.interface:
-                print(f"  │    Interface:  {client.interface}")
-            print(f"  │    Conn Type:  {conn_type}")
-            print(f"  └{'─' * 58}")
+                buf.append(f"  │    Interface:  {client.interface}")
+            buf.append(f"  │    Conn Type:  {conn_type}")
+            buf.append(_BOX_BOTTOM)
+
+        buf.append(f"\n  Total devices that will be created: {len(clients) + 1}")
+        buf.append("    • 1 router device")
+        buf.append(f"    • {len(clients)} tracked client devices")
 
-        print(f"\n  Total devices that will be created: {len(clients) + 1}")
-        print("    • 1 router device")
-        print(f"    • {len(clients)} tracked client devices")
+        sys.stdout.write("\n".join(buf) + "\n")
+        sys.stdout.flush()
 
     except Exception as e:
         print(f"  ❌ Error: {e}")
-        import traceback
         traceback.print_exc()
 
 
@@ -258,7 +295,10 @@ Examples:
         "--port", "-p", type=int, default=22, help="SSH port (default: 22)"
     )
     parser.add_argument(
-        "--verbose", "-v", action="store_true", help="Enable verbose output"
+        "--verbose",
+        "-v",
+        action="store_true",
+        help="Enable verbose output (includes the Home Assistant device preview)",
     )
 
     args = parser.parse_args()
@@ -266,46 +306,61 @@ Examples:
     # Prompt for password if not provided
     password = args.password
     if password is None:
+        import getpass
+
         password = getpass.getpass(f"Password for {args.username}@{args.host}: ")
+        args.password = password
 
-    args = parser.parse_args()
+    from datetime import datetime
+
+    print(_BANNER)
+    print(
+        f"  Host:     {args.host}",
+        f"  Username: {args.username}",
+        f"  Port:     {args.port}",
+        f"  Time:     {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        sep="\n",
+    )
 
-    print()
-    print("╔══════════════════════════════════════════════════════════╗")
-    print("║         EdgeRouter Integration Test Script               ║")
-    print("╚══════════════════════════════════════════════════════════╝")
-    print()
-    print(f"  Host:     {args.host}")
-    print(f"  Username: {args.username}")
-    print(f"  Port:     {args.port}")
-    print(f"  Time:     {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # Create API client
-    api = EdgeRouterAPI(
+    # Create API client; the context manager keeps one authenticated SSH
+    # session open for the whole test run instead of dialing per call
+    with EdgeRouterAPI(
         host=args.host,
         username=args.username,
         password=password,
         port=args.port,
-    )
-
-    # Run tests
-    if not test_connection(api):
-        print("\n❌ Connection test failed. Please check your credentials and network.")
-        sys.exit(1)
-
-    test_system_info(api)
-    test_arp_table(api)
-    test_dhcp_leases(api)
-    test_all_clients(api)
-    test_home_assistant_devices(api, args.host)
+    ) as api:
+        # Run tests
+        if not test_connection(api):
+            print("\n❌ Connection test failed. Please check your credentials and network.")
+            sys.exit(1)
+
+        # One SSH round trip fetches everything the table sections show,
+        # and the combined clients view is fetched exactly once and shared
+        try:
+            bundle = api.get_bundle()
+            clients = api.get_all_clients()
+        except EdgeRouterConnectionError as e:
+            print(f"\n❌ Failed to query the router: {e}")
+            sys.exit(1)
+
+        test_system_info(bundle["system_info"])
+        test_arp_table(bundle["arp"])
+        test_dhcp_leases(bundle["dhcp"])
+        test_all_clients(clients)
+        if args.verbose:
+            test_home_assistant_devices(args.host, clients, bundle["system_info"])
 
     print_header("Test Complete")
-    print("  ✅ All tests completed successfully!")
-    print()
-    print("  Your EdgeRouter integration should work correctly.")
-    print("  Copy the custom_components/edgerouter folder to your")
-    print("  Home Assistant config directory and restart.")
-    print()
+    print(
+        "  ✅ All tests completed successfully!",
+        "",
+        "  Your EdgeRouter integration should work correctly.",
+        "  Copy the custom_components/edgerouter folder to your",
+        "  Home Assistant config directory and restart.",
+        "",
+        sep="\n",
+    )
 
 
 if __name__ == "__main__":
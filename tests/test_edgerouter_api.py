@@ -0,0 +1,187 @@
+"""Unit tests for the pure parsing and batching logic in edgerouter_api.
+
+These cover the format-sensitive pieces that regress silently on firmware
+variations: the /proc/net/arp and ISC dhcpd.leases parsers, the sentinel
+splitting of batched SSH output, and the web API payload validation. None
+of them need a router or any paramiko mocking.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Import edgerouter_api directly, like test_edgerouter.py does, so the
+# integration package __init__ (which needs Home Assistant) stays unloaded
+sys.path.insert(
+    0, str(Path(__file__).parents[1] / "custom_components" / "edgerouter")
+)
+
+from edgerouter_api import (  # noqa: E402
+    _OK_MARKER,
+    _SPLIT_MARKER,
+    EdgeRouterAPI,
+    EdgeRouterConnectionError,
+)
+
+PROC_ARP = """\
+IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.10     0x1         0x2         AA:BB:CC:DD:EE:01     *        eth0
+192.168.1.11     0x1         0x0         00:00:00:00:00:00     *        eth0
+192.168.1.12     0x1         0x2         aa:bb:cc:dd:ee:02     *        switch0
+"""
+
+LEASES_FILE = """\
+lease 192.168.1.50 {
+  starts 3 2024/05/01 10:00:00;
+  ends 3 2024/05/01 22:00:00;
+  binding state active;
+  hardware ethernet AA:BB:CC:DD:EE:50;
+  client-hostname "laptop";
+}
+lease 192.168.1.51 {
+  ends never;
+  binding state active;
+  hardware ethernet aa:bb:cc:dd:ee:51;
+  client-hostname "?";
+}
+"""
+
+
+class TestParseProcArp:
+    """Tests for the /proc/net/arp parser."""
+
+    def test_parses_complete_entries(self):
+        entries = EdgeRouterAPI._parse_proc_arp(PROC_ARP)
+        assert entries == [
+            {"ip": "192.168.1.10", "mac": "aa:bb:cc:dd:ee:01", "interface": "eth0"},
+            {"ip": "192.168.1.12", "mac": "aa:bb:cc:dd:ee:02", "interface": "switch0"},
+        ]
+
+    def test_skips_incomplete_entries_by_flags(self):
+        output = (
+            "IP address  HW type  Flags  HW address  Mask  Device\n"
+            "192.168.1.20  0x1  0x0  aa:bb:cc:dd:ee:20  *  eth0\n"
+        )
+        assert EdgeRouterAPI._parse_proc_arp(output) == []
+
+    def test_skips_short_and_empty_lines(self):
+        output = "IP address  HW type  Flags  HW address  Mask  Device\n\ngarbage\n"
+        assert EdgeRouterAPI._parse_proc_arp(output) == []
+
+
+class TestParseLeasesFile:
+    """Tests for the ISC dhcpd leases database parser."""
+
+    def test_parses_active_leases(self):
+        leases = EdgeRouterAPI._parse_leases_file(LEASES_FILE)
+        assert leases == [
+            {
+                "ip": "192.168.1.50",
+                "mac": "aa:bb:cc:dd:ee:50",
+                "hostname": "laptop",
+                "expires": "2024/05/01 22:00:00",
+            },
+            {
+                "ip": "192.168.1.51",
+                "mac": "aa:bb:cc:dd:ee:51",
+                "hostname": None,
+                "expires": "never",
+            },
+        ]
+
+    def test_later_block_supersedes_and_inherits_hostname(self):
+        output = LEASES_FILE + (
+            "lease 192.168.1.50 {\n"
+            "  ends 3 2024/05/02 10:00:00;\n"
+            "  binding state active;\n"
+            "  hardware ethernet aa:bb:cc:dd:ee:50;\n"
+            "}\n"
+        )
+        leases = {lease["ip"]: lease for lease in EdgeRouterAPI._parse_leases_file(output)}
+        assert leases["192.168.1.50"]["expires"] == "2024/05/02 10:00:00"
+        # The renewal block omitted the hostname; the superseded one wins
+        assert leases["192.168.1.50"]["hostname"] == "laptop"
+
+    def test_free_binding_state_evicts_lease(self):
+        output = LEASES_FILE + (
+            "lease 192.168.1.50 {\n"
+            "  binding state free;\n"
+            "  hardware ethernet aa:bb:cc:dd:ee:50;\n"
+            "}\n"
+        )
+        leases = EdgeRouterAPI._parse_leases_file(output)
+        assert [lease["ip"] for lease in leases] == ["192.168.1.51"]
+
+    def test_ignores_trailing_ok_marker(self):
+        leases = EdgeRouterAPI._parse_leases_file(LEASES_FILE + _OK_MARKER + "\n")
+        assert len(leases) == 2
+
+    def test_block_without_mac_is_dropped(self):
+        output = "lease 192.168.1.60 {\n  binding state active;\n}\n"
+        assert EdgeRouterAPI._parse_leases_file(output) == []
+
+
+class _StubAPI(EdgeRouterAPI):
+    """API whose SSH layer is replaced by a canned output string."""
+
+    def __init__(self, output: str) -> None:
+        super().__init__("router.test", "user", "pass")
+        self._output = output
+
+    def _run(self, wrapped_command: str, command: str) -> str:
+        return self._output
+
+
+class TestExecMany:
+    """Tests for the sentinel-splitting batch protocol."""
+
+    def test_splits_output_per_command(self):
+        api = _StubAPI(f"first\n{_SPLIT_MARKER}\nsecond\n")
+        assert api._exec_many(["cmd-a", "cmd-b"]) == ["first\n", "second\n"]
+
+    def test_raises_on_marker_count_mismatch(self):
+        api = _StubAPI("first\nsecond\n")
+        with pytest.raises(EdgeRouterConnectionError):
+            api._exec_many(["cmd-a", "cmd-b"])
+
+
+class TestFlattenWebPayloads:
+    """Tests for the web API payload validation."""
+
+    def test_arp_rejects_non_list(self):
+        with pytest.raises(EdgeRouterConnectionError):
+            EdgeRouterAPI._flatten_web_arp(None)
+
+    def test_dhcp_rejects_non_dict(self):
+        with pytest.raises(EdgeRouterConnectionError):
+            EdgeRouterAPI._flatten_web_dhcp([])
+
+    def test_arp_flattens_and_filters(self):
+        output = [
+            {"ip": "192.168.1.10", "hwaddr": "AA:BB:CC:DD:EE:01", "intf": "eth0"},
+            {"ip": "192.168.1.11", "hwaddr": "00:00:00:00:00:00", "intf": "eth0"},
+        ]
+        assert EdgeRouterAPI._flatten_web_arp(output) == [
+            {"ip": "192.168.1.10", "mac": "aa:bb:cc:dd:ee:01", "interface": "eth0"},
+        ]
+
+    def test_dhcp_flattens_pools(self):
+        output = {
+            "dhcp-server-leases": {
+                "LAN": {
+                    "192.168.1.50": {
+                        "mac": "AA:BB:CC:DD:EE:50",
+                        "client-hostname": "laptop",
+                        "expiration": "2024/05/01 22:00:00",
+                    },
+                },
+            },
+        }
+        assert EdgeRouterAPI._flatten_web_dhcp(output) == [
+            {
+                "ip": "192.168.1.50",
+                "mac": "aa:bb:cc:dd:ee:50",
+                "hostname": "laptop",
+                "expires": "2024/05/01 22:00:00",
+            },
+        ]